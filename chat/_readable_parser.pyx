@@ -0,0 +1,76 @@
+# cython: language_level=3
+"""Cython-accelerated parser for the admin conversation text format.
+
+Compiled via ``python setup.py build_ext --inplace`` (requires Cython).
+The admin falls back to the pure-Python regex parser when this extension
+is not built, so the build step is entirely optional.
+"""
+
+
+cpdef list readable_to_json(str text):
+    """Convert readable "User:"/"Assistant:" text to a list of message dicts.
+
+    Semantics match ChatAdminForm._readable_to_json: a role header starts
+    a message, blank lines end it, other lines continue it, and text
+    before the first header is ignored.
+    """
+    if not text or not text.strip():
+        return []
+
+    cdef list messages = []
+    cdef list current_content = []
+    cdef str current_role = ""
+    cdef str line, head, content
+    cdef Py_ssize_t pos = 0
+    cdef Py_ssize_t newline
+    cdef Py_ssize_t n = len(text)
+
+    while pos <= n:
+        newline = text.find('\n', pos)
+        if newline == -1:
+            line = text[pos:]
+            pos = n + 1
+        else:
+            line = text[pos:newline]
+            pos = newline + 1
+        line = line.strip()
+
+        if not line:
+            if current_role and current_content:
+                messages.append({
+                    'role': current_role,
+                    'content': '\n'.join(current_content).strip()
+                })
+                current_content = []
+            continue
+
+        # Only lowercase the first 10 chars - enough to test both prefixes
+        head = line[:10].lower()
+        if head.startswith('user:'):
+            if current_role and current_content:
+                messages.append({
+                    'role': current_role,
+                    'content': '\n'.join(current_content).strip()
+                })
+            current_role = 'user'
+            content = line[5:].strip()
+            current_content = [content] if content else []
+        elif head.startswith('assistant:'):
+            if current_role and current_content:
+                messages.append({
+                    'role': current_role,
+                    'content': '\n'.join(current_content).strip()
+                })
+            current_role = 'assistant'
+            content = line[10:].strip()
+            current_content = [content] if content else []
+        elif current_role:
+            current_content.append(line)
+
+    if current_role and current_content:
+        messages.append({
+            'role': current_role,
+            'content': '\n'.join(current_content).strip()
+        })
+
+    return messages
@@ -1,8 +1,27 @@
 """Django admin configuration for Chat model."""
+import re
 from django import forms
 from django.contrib import admin
+from django.db.models import F, Func, IntegerField
 from .models import Chat
 
+# Matches a "User:" / "Assistant:" message header at the start of a line;
+# compiled once so parsing scans the whole text in a single pass instead
+# of lowercasing and prefix-testing every line in Python
+_ROLE_RE = re.compile(r'^\s*(user|assistant):[ \t]*', re.IGNORECASE | re.MULTILINE)
+# Blank lines (possibly whitespace-only) separate messages of the same role
+_BLANK_LINE_RE = re.compile(r'\n\s*\n')
+# Whitespace around newlines inside a block (blocks contain no blank
+# lines, so this normalizes line edges in one C-level pass)
+_LINE_WS_RE = re.compile(r'\s*\n\s*')
+
+# Optional compiled parser (python setup.py build_ext --inplace); the
+# pure-Python regex path below is the fallback when it isn't built
+try:
+    from ._readable_parser import readable_to_json as _readable_to_json_fast
+except ImportError:
+    _readable_to_json_fast = None
+
 class ChatAdminForm(forms.ModelForm):
     """Custom form for Chat admin with readable conversation format"""
     conversation_history_text = forms.CharField(
@@ -57,52 +76,27 @@ class ChatAdminForm(forms.ModelForm):
         if not text or not text.strip():
             return []
 
-        messages = []
-        lines = text.split('\n')
-        current_role = None
-        current_content = []
-
-        for line in lines:
-            line = line.strip()
-            if not line:
-                if current_role and current_content:
-                    messages.append({
-                        'role': current_role.lower(),
-                        'content': '\n'.join(current_content).strip()
-                    })
-                    current_content = []
-                continue
-
-            # Check if line starts with "User:" or "Assistant:"
-            if line.lower().startswith('user:'):
-                if current_role and current_content:
-                    messages.append({
-                        'role': current_role.lower(),
-                        'content': '\n'.join(current_content).strip()
-                    })
-                current_role = 'user'
-                content = line[5:].strip()  # Remove "User:" prefix
-                current_content = [content] if content else []
-            elif line.lower().startswith('assistant:'):
-                if current_role and current_content:
-                    messages.append({
-                        'role': current_role.lower(),
-                        'content': '\n'.join(current_content).strip()
-                    })
-                current_role = 'assistant'
-                content = line[10:].strip()  # Remove "Assistant:" prefix
-                current_content = [content] if content else []
-            else:
-                # Continuation of previous message
-                if current_role:
-                    current_content.append(line)
+        if _readable_to_json_fast is not None:
+            return _readable_to_json_fast(text)
 
-        # Add last message
-        if current_role and current_content:
-            messages.append({
-                'role': current_role.lower(),
-                'content': '\n'.join(current_content).strip()
-            })
+        messages = []
+        matches = list(_ROLE_RE.finditer(text))
+        for idx, match in enumerate(matches):
+            role = match.group(1).lower()
+            # The segment runs from the end of this header to the start of
+            # the next one (or end of text); text before the first header
+            # has no role and is ignored, as before
+            segment_end = (
+                matches[idx + 1].start() if idx + 1 < len(matches)
+                else len(text)
+            )
+            segment = text[match.end():segment_end]
+            # Blank lines split a segment into separate messages of the
+            # same role; other lines are continuations
+            for block in _BLANK_LINE_RE.split(segment):
+                content = _LINE_WS_RE.sub('\n', block).strip()
+                if content:
+                    messages.append({'role': role, 'content': content})
 
         return messages
 
@@ -148,8 +142,28 @@ class ChatAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        """Annotate history length so the changelist doesn't hit the
+        ChatMessage table once per row, join the user in the same query,
+        and skip transferring the (potentially huge) history JSON when
+        only its length is displayed."""
+        queryset = super().get_queryset(request)
+        return queryset.select_related('user').only(
+            'session_id', 'chat_id', 'user__username', 'title',
+            'created_at', 'updated_at', 'history_backfilled'
+        ).annotate(
+            _history_len=Func(
+                F('conversation_history'),
+                function='JSON_ARRAY_LENGTH',
+                output_field=IntegerField()
+            )
+        )
+
     def conversation_length(self, obj):
         """Display number of messages in conversation history"""
+        count = getattr(obj, '_history_len', None)
+        if count:
+            return count
         history = obj.get_conversation_history()
         return len(history) if history else 0
     conversation_length.short_description = 'Messages'
@@ -0,0 +1,171 @@
+"""Cache-backed storage for per-chat active document text.
+
+Extracted document text used to live in request.session['chat_documents'],
+so every authenticated request deserialized (and on change, re-serialized)
+up to ~100 KB of text alongside the rest of the session. Keeping the text
+in the cache under a per-(user, chat) key means session I/O stays a few
+bytes and only the views that actually need document context pay for one
+targeted cache GET.
+
+With REDIS_URL configured (see settings) the entries live in Redis and are
+shared across workers; otherwise they sit in the default local-memory
+cache, which is fine for single-process development.
+"""
+import pickle
+
+from django.core.cache import cache
+
+# Optional compression for the stored text. Document lists and context
+# blocks run to ~100 KB of natural-language text, which zstd shrinks
+# 3-5x - fewer bytes to Redis per GET and less to deserialize. Small
+# values and installs without zstandard are stored as-is.
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if zstandard is not None:
+    _CCTX = zstandard.ZstdCompressor(level=3)
+    _DCTX = zstandard.ZstdDecompressor()
+
+# Below this, compression overhead outweighs the byte savings
+COMPRESS_MIN_BYTES = 4096
+
+# Active documents expire after a day; the authoritative copy of the
+# extracted text stays in the Document table
+DOCS_TTL = 86400
+
+
+def _pack(value):
+    """Compress a value for storage when it's large enough to pay off;
+    small values (and installs without zstandard) pass through."""
+    if zstandard is None:
+        return value
+    raw = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    if len(raw) < COMPRESS_MIN_BYTES:
+        return value
+    return _CCTX.compress(raw)
+
+
+def _unpack(value):
+    """Reverse _pack. Stored values are never plain bytes, so bytes
+    always means a compressed frame."""
+    if zstandard is not None and isinstance(value, bytes):
+        return pickle.loads(_DCTX.decompress(value))
+    return value
+
+
+def _docs_key(user_id, chat_id):
+    return f'docs:{user_id}:{chat_id}'
+
+
+def _index_key(user_id):
+    return f'docs:index:{user_id}'
+
+
+def _ctx_key(user_id, chat_id):
+    return f'ctx:{user_id}:{chat_id}'
+
+
+def _map_key(user_id):
+    return f'docs:map:{user_id}'
+
+
+def _update_doc_map(user_id, chat_id, old_documents, new_documents):
+    """Keep the per-user reverse map {document_id: [chat_id, ...]} in
+    step with one chat's document set, so remove_document can go
+    straight to the affected chats instead of scanning every chat the
+    user has documents in."""
+    old_ids = {d.get('id') for d in old_documents}
+    new_ids = {d.get('id') for d in new_documents}
+    if old_ids == new_ids:
+        return
+    doc_map = cache.get(_map_key(user_id)) or {}
+    for doc_id in old_ids - new_ids:
+        chats = doc_map.get(doc_id, [])
+        if chat_id in chats:
+            chats.remove(chat_id)
+            if not chats:
+                doc_map.pop(doc_id, None)
+    for doc_id in new_ids - old_ids:
+        doc_map.setdefault(doc_id, [])
+        if chat_id not in doc_map[doc_id]:
+            doc_map[doc_id].append(chat_id)
+    cache.set(_map_key(user_id), doc_map, DOCS_TTL)
+
+
+def get_documents(user_id, chat_id):
+    """Return the active documents for a chat (list of dicts with
+    id/filename/text), or [] when none are stored."""
+    if not chat_id:
+        return []
+    return _unpack(cache.get(_docs_key(user_id, chat_id))) or []
+
+
+def set_documents(user_id, chat_id, documents):
+    """Store the active documents for a chat, keeping the per-user index
+    of chats that have documents up to date. Any prebuilt prompt context
+    is dropped since it no longer matches the document set."""
+    index = cache.get(_index_key(user_id)) or []
+    if documents:
+        old_documents = _unpack(cache.get(_docs_key(user_id, chat_id))) or []
+        cache.set(_docs_key(user_id, chat_id), _pack(documents), DOCS_TTL)
+        cache.delete(_ctx_key(user_id, chat_id))
+        _update_doc_map(user_id, chat_id, old_documents, documents)
+        if chat_id not in index:
+            index.append(chat_id)
+            cache.set(_index_key(user_id), index, DOCS_TTL)
+    else:
+        clear_chat(user_id, chat_id)
+
+
+def clear_chat(user_id, chat_id):
+    """Drop the active documents (and any prebuilt context) for one chat."""
+    old_documents = _unpack(cache.get(_docs_key(user_id, chat_id))) or []
+    if old_documents:
+        _update_doc_map(user_id, chat_id, old_documents, [])
+    cache.delete(_docs_key(user_id, chat_id))
+    cache.delete(_ctx_key(user_id, chat_id))
+    index = cache.get(_index_key(user_id)) or []
+    if chat_id in index:
+        index.remove(chat_id)
+        cache.set(_index_key(user_id), index, DOCS_TTL)
+
+
+def get_context(user_id, chat_id):
+    """Return the prebuilt prompt-context string for a chat's documents,
+    or None when it hasn't been built since the documents last changed."""
+    if not chat_id:
+        return None
+    return _unpack(cache.get(_ctx_key(user_id, chat_id)))
+
+
+def set_context(user_id, chat_id, context):
+    """Store the prebuilt prompt-context string for a chat's documents,
+    so the chat hot path does one GET instead of re-truncating and
+    re-joining the document text every turn."""
+    cache.set(_ctx_key(user_id, chat_id), _pack(context), DOCS_TTL)
+
+
+def remove_document(user_id, document_id):
+    """Remove one document from every chat that has it active (used when
+    the document itself is deleted). The reverse map points straight at
+    the affected chats, so chats without the document aren't read or
+    rewritten at all - most deletions touch zero or one chat."""
+    doc_map = cache.get(_map_key(user_id)) or {}
+    chat_ids = doc_map.get(document_id, [])
+    for chat_id in list(chat_ids):
+        documents = _unpack(cache.get(_docs_key(user_id, chat_id))) or []
+        remaining = [d for d in documents if d.get('id') != document_id]
+        # set_documents updates the map entry (and drops it once empty)
+        set_documents(user_id, chat_id, remaining)
+
+
+def clear_user(user_id):
+    """Drop all stored documents for a user (used on logout)."""
+    index = cache.get(_index_key(user_id)) or []
+    for chat_id in index:
+        cache.delete(_docs_key(user_id, chat_id))
+        cache.delete(_ctx_key(user_id, chat_id))
+    cache.delete(_index_key(user_id))
+    cache.delete(_map_key(user_id))
@@ -0,0 +1,25 @@
+# Generated manually to replace unique_together with an explicit constraint
+# pylint: disable=invalid-name,missing-module-docstring
+"""Migration converting Chat unique_together to a named UniqueConstraint."""
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    """Migration converting Chat unique_together to a named UniqueConstraint."""
+
+    dependencies = [
+        ('chat', '0011_remove_document_file'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='chat',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='chat',
+            constraint=models.UniqueConstraint(
+                fields=('chat_id', 'user'), name='chat_chatid_user_uniq'
+            ),
+        ),
+    ]
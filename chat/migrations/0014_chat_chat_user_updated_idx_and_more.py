@@ -0,0 +1,23 @@
+# Generated by Django 5.2.17 on 2026-08-26 10:35
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0013_chat_history_backfilled'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chat',
+            index=models.Index(fields=['user', '-updated_at'], name='chat_user_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['chat', 'created_at'], name='chatmsg_chat_created_idx'),
+        ),
+    ]
@@ -1,6 +1,9 @@
 """Django models for chat application."""
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Max
 
 
 class Chat(models.Model):
@@ -21,14 +24,35 @@ class Chat(models.Model):
         default=list, blank=True,
         help_text="Stores complete conversation history as JSON array"
     )
+    history_backfilled = models.BooleanField(
+        default=True,
+        help_text=(
+            "False only for rows created before conversation_history "
+            "existed; lets genuinely empty chats skip the ChatMessage "
+            "fallback query"
+        )
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:  # pylint: disable=too-few-public-methods
         """Meta options for Chat model."""
         ordering = ['-updated_at']
-        # Ensure chat_id is unique per user, but session_id is globally unique
-        unique_together = [['chat_id', 'user']]
+        # Ensure chat_id is unique per user, but session_id is globally
+        # unique (its unique=True field already maintains that btree)
+        constraints = [
+            models.UniqueConstraint(
+                fields=['chat_id', 'user'], name='chat_chatid_user_uniq'
+            )
+        ]
+        # get_chats filters on user and orders by -updated_at; this
+        # index serves that in one scan (the (chat_id, user) lookups are
+        # already covered by the unique constraint's index)
+        indexes = [
+            models.Index(
+                fields=['user', '-updated_at'], name='chat_user_updated_idx'
+            )
+        ]
 
     def __str__(self):
         # pylint: disable=no-member
@@ -38,28 +62,64 @@ class Chat(models.Model):
     def get_next_session_id(cls):
         """Get the next global session ID (starting from 1, sequential across all users)"""
         # pylint: disable=no-member
-        last_chat = cls.objects.order_by('-session_id').first()
-        if last_chat and last_chat.session_id:
-            return last_chat.session_id + 1
-        return 1
+        if getattr(settings, 'REDIS_URL', None):
+            # Atomic O(1) INCR shared across workers - no aggregate and
+            # no race between concurrent new-chat creations. Seeded from
+            # the current MAX so a flushed Redis can't hand out ids that
+            # are already taken; session_id's UNIQUE index still backstops
+            # any duplicate.
+            try:
+                return cache.incr('chat:session_seq')
+            except ValueError:
+                max_id = cls.objects.aggregate(
+                    max_id=Max('session_id')
+                )['max_id'] or 0
+                cache.add('chat:session_seq', max_id, None)
+                return cache.incr('chat:session_seq')
+        # MAX() on session_id is a single index probe (unique=True already
+        # maintains the btree); running inside a transaction keeps the
+        # read-then-insert window as small as possible
+        with transaction.atomic():
+            max_id = cls.objects.aggregate(max_id=Max('session_id'))['max_id']
+        return (max_id or 0) + 1
 
     def get_conversation_history(self):
-        """Get conversation history as a list of message dicts"""
+        """Get conversation history as a list of message dicts.
+        The result is cached on the instance so repeated calls (e.g. per
+        admin row render) don't rebuild it or re-query ChatMessage."""
+        if hasattr(self, '_cached_history'):
+            return self._cached_history
         if not self.conversation_history:
-            # If empty, build from ChatMessage objects for backward compatibility
-            history = []
+            if self.history_backfilled:
+                # Genuinely empty (not a pre-JSONField legacy row) - no
+                # need to query ChatMessage at all
+                self._cached_history = []
+                return []
+            # Legacy row: build from ChatMessage rows for backward
+            # compatibility; .values() skips model instantiation entirely
             # pylint: disable=no-member
-            for msg in self.messages.all().order_by('created_at'):
-                history.append({
-                    'role': msg.role,
-                    'content': msg.content,
-                    'created_at': msg.created_at.isoformat()
-                })
+            history = [
+                {
+                    'role': row['role'],
+                    'content': row['content'],
+                    'created_at': row['created_at'].isoformat()
+                }
+                for row in self.messages.order_by('created_at').values(
+                    'role', 'content', 'created_at'
+                )
+            ]
+            self._cached_history = history
             return history
+        self._cached_history = self.conversation_history
         return self.conversation_history
 
-    def add_to_history(self, role, content):
-        """Add a message to conversation history"""
+    def add_to_history(self, role, content, commit=True):
+        """Add a message to conversation history.
+
+        Pass commit=False to batch several appends into one save, e.g.:
+        chat.add_to_history('user', question, commit=False)
+        chat.add_to_history('assistant', answer)
+        """
         if not self.conversation_history:
             self.conversation_history = []
 
@@ -67,7 +127,27 @@ class Chat(models.Model):
             'role': role,
             'content': content
         })
-        self.save()
+        # Drop the cached copy so the next read reflects the append
+        self.__dict__.pop('_cached_history', None)
+        if commit:
+            # Only ship the changed columns; a plain save() would rewrite
+            # every field of the row alongside the JSON blob
+            self.save(update_fields=['conversation_history', 'updated_at'])
+
+    def append_history_bulk(self, entries):
+        """Append several (role, content) pairs to conversation history
+        in memory. Callers follow up with one save(update_fields=...) so
+        a whole turn costs a single UPDATE:
+
+        chat.append_history_bulk([('user', q), ('assistant', a)])
+        chat.save(update_fields=['conversation_history', 'updated_at'])
+        """
+        if not self.conversation_history:
+            self.conversation_history = []
+        self.conversation_history.extend(
+            {'role': role, 'content': content} for role, content in entries
+        )
+        self.__dict__.pop('_cached_history', None)
 
 
 class ChatMessage(models.Model):
@@ -82,6 +162,13 @@ class ChatMessage(models.Model):
     class Meta:  # pylint: disable=too-few-public-methods
         """Meta options for ChatMessage model."""
         ordering = ['created_at']
+        # chat.messages is always read in created_at order; without this
+        # the per-chat fetch index-scans on chat_id then sorts
+        indexes = [
+            models.Index(
+                fields=['chat', 'created_at'], name='chatmsg_chat_created_idx'
+            )
+        ]
 
     def __str__(self):
         # pylint: disable=no-member
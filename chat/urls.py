@@ -24,6 +24,10 @@ urlpatterns = [
         views.clear_chat_documents, name='clear_chat_documents'
     ),
     path('api/documents/', views.get_documents, name='get_documents'),
+    path(
+        'api/documents/<int:document_id>/status/',
+        views.document_status, name='document_status'
+    ),
     path(
         'api/documents/<int:document_id>/summarize/',
         views.summarize_document, name='summarize_document'
@@ -1,31 +1,218 @@
 """Views for chat application."""
+import asyncio
+import hashlib
 import json
+import logging
 import os
-import traceback
+import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from asgiref.sync import sync_to_async
 from dotenv import load_dotenv
-from groq import Groq
+from groq import AsyncGroq, Groq
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.http import JsonResponse
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connections, transaction
+from django.db.models import Q
+from django.db.models.functions import Substr
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
+from . import docstore
 from .document_processor import extract_text_from_file, get_file_type
 from .models import Chat, ChatMessage, Document
 
 load_dotenv()
 
-# Initialize Groq client (will be created when needed)
+logger = logging.getLogger(__name__)
+
+# Optional fast JSON codec. orjson parses and serializes several times
+# faster than stdlib json and allocates less, which matters on the chat
+# hot path where request/response payloads (history, document answers)
+# run to tens of KB. Everything below falls back to stdlib json.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Second-choice fast decoder for request bodies. msgspec's C decoder is
+# in the same league as orjson; it only kicks in when orjson is absent,
+# keeping a single preferred codec when both are installed.
+try:
+    import msgspec.json
+except ImportError:
+    msgspec = None
+
+# Optional tokenizer for the document Q&A prompt budget. Character
+# slicing over- or under-shoots the model's real token limit (English
+# runs ~4 chars/token, other scripts far less); with tiktoken installed
+# the document head is cut at a token budget instead, so the prompt
+# carries as much informative context as the budget allows. Falls back
+# to the plain 8000-char slice without it.
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+def _json_loads(data):
+    """Parse a JSON request body with the fastest available codec.
+    Malformed input always surfaces as json.JSONDecodeError so the
+    view-level handlers stay codec-agnostic (orjson's error already
+    subclasses it; msgspec's is translated)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        try:
+            return msgspec.json.decode(data)
+        except msgspec.DecodeError as exc:
+            raise json.JSONDecodeError(str(exc), '', 0) from exc
+    return json.loads(data)
+
+# Compact separators for the stdlib fallback - orjson emits compact
+# output by default, but json.dumps pads ': ' and ', ', which adds up
+# over multi-KB history and answer payloads
+_COMPACT_SEPARATORS = (',', ':')
+
+def _json_dumps(data):
+    """Serialize to a JSON string with the fastest available codec
+    (used where a str is needed, e.g. SSE frames)."""
+    if orjson is not None:
+        return orjson.dumps(data).decode()
+    return json.dumps(data, separators=_COMPACT_SEPARATORS)
+
+def _json_response(data, status=200):
+    """JsonResponse equivalent that serializes with orjson when it is
+    installed."""
+    if orjson is not None:
+        return HttpResponse(
+            orjson.dumps(data), status=status,
+            content_type='application/json'
+        )
+    return JsonResponse(
+        data, status=status,
+        json_dumps_params={'separators': _COMPACT_SEPARATORS}
+    )
+
+# Accepted position aliases for document selection - frozensets give O(1)
+# membership without allocating a list per request
+_FIRST_POSITIONS = frozenset({'first', '1'})
+_SECOND_POSITIONS = frozenset({'second', '2'})
+
+# Password checks as C-level regex scans (short-circuit on first match)
+# instead of per-character Python loops. [^\W\d_] (not non-word, not
+# decimal digit, not underscore) matches every letter str.isalpha does
+# in any script; it is marginally laxer only for numeric signs like
+# '³' that \w counts as word characters
+_HAS_DIGIT = re.compile(r'\d').search
+_HAS_ALPHA = re.compile(r'[^\W\d_]').search
+
+# System prompts for the chat endpoint, hoisted so each request picks a
+# ready-made constant instead of re-concatenating the text; only the
+# multi-document variant has a dynamic part (the document count)
+_SYSTEM_PROMPT_SINGLE_DOC = (
+    "You are a helpful AI assistant with access to a "
+    "document that the user has uploaded.\n"
+    "You can see the full content of the document and "
+    "should answer questions based on it.\n"
+    "When the user asks to \"summarize\" or \"summarize "
+    "the attached pdf\" or similar, automatically provide "
+    "a summary of the document.\n"
+    "Provide brief, concise answers that cover all "
+    "important information comprehensively.\n"
+    "Be succinct but ensure you include all key points.\n"
+    "When answering, use information from the document "
+    "when relevant.\n"
+    "Never say you can't access attachments or ask the "
+    "user to paste text - you already have the document "
+    "content."
+)
+_SYSTEM_PROMPT_MULTI_DOC = (
+    "You are a helpful AI assistant with access to "
+    "{doc_count} documents that the user has uploaded.\n"
+    "You can see the full content of all documents and "
+    "should answer questions based on them.\n"
+    "The documents are numbered: Document 1 (first "
+    "document), Document 2 (second document), etc.\n"
+    "When the user asks to \"summarize the first document\" "
+    "or \"summarize document 1\", summarize Document 1.\n"
+    "When the user asks to \"summarize the second document\" "
+    "or \"summarize document 2\", summarize Document 2.\n"
+    "When the user asks to \"summarize\" without "
+    "specifying, summarize all documents.\n"
+    "Provide brief, concise answers that cover all "
+    "important information comprehensively.\n"
+    "Be succinct but ensure you include all key points.\n"
+    "When answering, use information from the relevant "
+    "document(s) when relevant.\n"
+    "Never say you can't access attachments or ask the "
+    "user to paste text - you already have the document "
+    "content."
+)
+_SYSTEM_PROMPT_NO_DOC = (
+    "You are a helpful AI assistant. Provide brief, concise "
+    "answers that cover all important information "
+    "comprehensively. Be succinct but ensure you include all "
+    "key points. Keep responses focused and to the point while "
+    "maintaining completeness. Use clear, direct language and "
+    "avoid unnecessary elaboration."
+)
+
+# Prompt templates for the document endpoints, built once at import so
+# request handling does a single .format()/concat instead of assembling
+# the constant segments every call
+DOC_TRUNCATION_SUFFIX = "\n\n[Document truncated for length...]"
+
+_ASK_PROMPT_PREFIX_TMPL = (
+    "Based on the following document, please answer the user's question.\n"
+    "If the answer is not in the document, please say so clearly.\n\n"
+    "Document content:\n{doc}\n\n"
+)
+
+_ASK_PROMPT_QUESTION_TMPL = (
+    "User's question: {question}\n\n"
+    "Please provide a clear, accurate answer based on the document content."
+)
+
+_SUMMARY_PROMPT_TMPL = (
+    "Please provide a comprehensive summary of "
+    "Document {idx} ('{filename}').\n"
+    "The document is {length} characters long. "
+    "Here is the content:\n\n"
+    "{doc}\n\n"
+    "Please provide:\n"
+    "1. A brief overview (2-3 sentences)\n"
+    "2. Key points and main topics\n"
+    "3. Important details or findings\n"
+    "4. Any conclusions or recommendations if present\n\n"
+    "Format your response in a clear, structured manner."
+)
+
+# Initialize Groq client (created on first use, then reused so the
+# underlying httpx connection pool keeps TLS connections to api.groq.com
+# alive across requests instead of re-handshaking per call)
+@lru_cache(maxsize=1)
 def get_groq_client():
-    """Initialize and return a Groq API client."""
+    """Initialize and return a Groq API client (cached singleton)."""
     api_key = os.getenv('GROQ_API_KEY')
     if not api_key:
         raise ValueError("GROQ_API_KEY not found in environment variables")
     return Groq(api_key=api_key)
 
+@lru_cache(maxsize=1)
+def get_async_groq_client():
+    """Initialize and return an async Groq API client for async views
+    (cached singleton)."""
+    api_key = os.getenv('GROQ_API_KEY')
+    if not api_key:
+        raise ValueError("GROQ_API_KEY not found in environment variables")
+    return AsyncGroq(api_key=api_key)
+
 def login_view(request):
     """Handle user login"""
     if request.user.is_authenticated:
@@ -64,16 +251,17 @@ def signup_view(request):  # pylint: disable=too-many-branches
             errors.append('Username is required.')
         elif len(username) < 3:
             errors.append('Username must be at least 3 characters long.')
-        elif User.objects.filter(username=username).exists():
-            errors.append('Username already exists.')
+        # Uniqueness is left to the UNIQUE(username) constraint at create
+        # time below - a .filter(...).exists() pre-check costs an extra
+        # SELECT and still races with concurrent signups
 
         if not password:
             errors.append('Password is required.')
         elif len(password) < 8:
             errors.append('Password must be at least 8 characters long.')
-        elif not any(char.isdigit() for char in password):
+        elif not _HAS_DIGIT(password):
             errors.append('Password must contain at least one number.')
-        elif not any(char.isalpha() for char in password):
+        elif not _HAS_ALPHA(password):
             errors.append('Password must contain at least one letter.')
 
         if password != password_confirm:
@@ -93,6 +281,8 @@ def signup_view(request):  # pylint: disable=too-many-branches
             login(request, user)
             messages.success(request, 'Account created successfully!')
             return redirect('index')
+        except IntegrityError:
+            messages.error(request, 'Username already exists.')
         except Exception as e:
             messages.error(request, f'Error creating account: {str(e)}')
 
@@ -100,7 +290,9 @@ def signup_view(request):  # pylint: disable=too-many-branches
 
 def logout_view(request):
     """Handle user logout - clear session and redirect to login"""
-    # Clear all session data including active documents
+    # Drop cached active documents along with the session
+    if request.user.is_authenticated:
+        docstore.clear_user(request.user.id)
     request.session.flush()
     # Logout the user
     logout(request)
@@ -121,24 +313,202 @@ def index(request):
     response['Expires'] = '0'
     return response
 
+# Per-document cap for prompt context (summaries still see the full
+# stored text)
+MAX_CONTEXT_CHARS = 15000
+_CONTEXT_TRUNCATION_NOTE = (
+    "\n\n[Document content continues but was truncated...]"
+)
+
+def _truncate_for_context(doc_text):
+    """Apply the per-document context cap; the slice happens once at
+    upload time, not per chat turn."""
+    if len(doc_text) > MAX_CONTEXT_CHARS:
+        return doc_text[:MAX_CONTEXT_CHARS] + _CONTEXT_TRUNCATION_NOTE
+    return doc_text
+
+# Cached document Q&A answers live for an hour; the document text they
+# were computed from is immutable once extraction finishes, so the TTL
+# only bounds cache growth, not staleness
+ANSWER_CACHE_TTL = 3600
+
+# The rendered document portion of the Q&A prompt is likewise immutable,
+# so it can live longer; a day matches the active-document TTL
+PREFIX_CACHE_TTL = 86400
+
+# Token budget for the document head in the Q&A prompt (~8000 chars of
+# average English), applied when tiktoken is available
+ASK_DOC_TOKEN_BUDGET = 2000
+
+@lru_cache(maxsize=1)
+def _get_token_encoder():
+    """Return the tiktoken encoder used for prompt truncation, or None
+    when tiktoken isn't installed or its encoding data can't be loaded
+    (first use fetches it over the network)."""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding('cl100k_base')
+    except Exception:  # pylint: disable=broad-exception-caught
+        logger.warning(
+            "tiktoken encoding unavailable; falling back to "
+            "character-based prompt truncation"
+        )
+        return None
+
+def _prefix_cache_key(document_id):
+    return f'ask:prefix:{document_id}'
+
+def _answer_cache_key(document_id, question):
+    """Cache key for a (document, question) pair. The question is
+    normalized (case-folded, punctuation stripped, whitespace collapsed)
+    so trivial rephrasings like 'What is the total?' and 'what is the
+    total' share an entry; a hash keeps the key short and memcached-safe
+    regardless of question length."""
+    normalized = re.sub(r'[^\w\s]', '', question.casefold())
+    normalized = ' '.join(normalized.split())
+    digest = hashlib.sha1(normalized.encode()).hexdigest()
+    return f'ask:{document_id}:{digest}'
+
+def _build_document_context(active_documents):
+    """Build the joined context block injected into the prompt. Called
+    once when the document set changes; chat turns reuse the cached
+    result instead of re-slicing ~30 KB of text."""
+    doc_contexts = []
+    for idx, doc in enumerate(active_documents, 1):
+        # context_text is pre-truncated at upload; fall back to slicing
+        # the full text for entries stored before it existed
+        doc_text = doc.get('context_text')
+        if doc_text is None:
+            doc_text = _truncate_for_context(doc.get('text', ''))
+        doc_filename = doc.get('filename', f'Document {idx}')
+        doc_contexts.append(
+            f"Document {idx} ('{doc_filename}'):\n{doc_text}"
+        )
+    return "\n\n---\n\n".join(doc_contexts)
+
+def _get_active_documents(request, chat_id):
+    """Get the active documents for a chat from the document store.
+    Runs in a worker thread when called from async views."""
+    # List of dicts: {id, filename, text}
+    return docstore.get_documents(request.user.id, chat_id)
+
+def _get_document_context(request, chat_id, active_documents):
+    """Get the prompt-context block for a chat's documents, preferring
+    the copy prebuilt at upload time and rebuilding (then re-caching) it
+    on a cache miss. Runs in a worker thread when called from async
+    views."""
+    context = docstore.get_context(request.user.id, chat_id)
+    if context is None:
+        context = _build_document_context(active_documents)
+        if chat_id:
+            docstore.set_context(request.user.id, chat_id, context)
+    return context
+
+def _persist_chat_turn(request, chat_id, user_message, ai_response):
+    """Save a chat turn (user message + AI response) to the database.
+    Returns the chat_id (generated when the client didn't send one).
+    Runs in a worker thread when called from async views."""
+    # pylint: disable=no-member,redefined-outer-name
+    # uuid4 reads urandom, so only pay for it when the caller didn't
+    # supply a chat_id; .hex skips hyphen formatting and stores/indexes
+    # 32 chars instead of 36
+    chat_id = chat_id or uuid.uuid4().hex
+
+    # One transaction (and one commit/fsync) for the whole turn; the row
+    # lock from select_for_update stops concurrent requests for the same
+    # chat from interleaving their history read-modify-writes (a no-op on
+    # SQLite, which serializes writers anyway)
+    with transaction.atomic():
+        # Title for a chat created by this turn; the callable session_id
+        # default only runs when a row is actually created, so the hit
+        # path is a single (locked) SELECT
+        title = user_message[:50] if len(user_message) > 50 else user_message
+        if not title:
+            title = 'New Chat'
+        chat, _created = Chat.objects.select_for_update().get_or_create(
+            chat_id=chat_id,
+            user=request.user,
+            defaults={
+                'session_id': Chat.get_next_session_id,
+                'title': title,
+            }
+        )
+
+        # Save both messages in one INSERT instead of a round-trip each
+        ChatMessage.objects.bulk_create([
+            ChatMessage(chat=chat, role='user', content=user_message),
+            ChatMessage(chat=chat, role='assistant', content=ai_response),
+        ])
+
+        # Update conversation history in Chat model
+        chat.append_history_bulk([
+            ('user', user_message),
+            ('assistant', ai_response),
+        ])
+
+        # Update chat title if it's still "New Chat" and we have a better title
+        update_fields = ['conversation_history', 'updated_at']
+        if chat.title == 'New Chat' and user_message:
+            title = user_message[:50] if len(user_message) > 50 else user_message
+            chat.title = title
+            update_fields.append('title')
+
+        # One UPDATE covering history (and title when it changed)
+        chat.save(update_fields=update_fields)
+
+    return chat_id
+
+async def _chat_event_stream(request, groq_client, model, messages,
+                             chat_id, user_message):
+    """Yield the Groq completion as server-sent events, then persist the
+    full turn once the stream closes (same save-to-DB semantics as the
+    non-streaming path). The final event carries the chat_id."""
+    # pylint: disable=broad-exception-caught,redefined-outer-name
+    try:
+        stream = await groq_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=800,
+            stream=True,
+        )
+        parts = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content or ''
+            if delta:
+                parts.append(delta)
+                yield f"data: {_json_dumps({'delta': delta})}\n\n"
+        ai_response = ''.join(parts)
+
+        # AUTOMATICALLY SAVE CONVERSATION TO DATABASE
+        chat_id = await sync_to_async(_persist_chat_turn)(
+            request, chat_id, user_message, ai_response
+        )
+        yield f"data: {_json_dumps({'done': True, 'chat_id': chat_id})}\n\n"
+    except Exception as e:
+        # Headers are already sent; the error has to travel in-band
+        yield f"data: {_json_dumps({'error': str(e)})}\n\n"
+
 @login_required
 @csrf_exempt
 @require_http_methods(["POST"])
-def chat(request):  # pylint: disable=too-many-locals,too-many-branches,too-many-statements
+async def chat(request):  # pylint: disable=too-many-locals,too-many-branches,too-many-statements
     """Handle chat messages and return AI responses.
-    Automatically injects active document text from session if available."""
+    Automatically injects active document text from session if available.
+    Async so the worker serves other requests during the Groq round-trip."""
     try:
-        data = json.loads(request.body)
+        data = _json_loads(request.body)
         user_message = data.get('message', '').strip()
 
         if not user_message:
-            return JsonResponse({'error': 'Message cannot be empty'}, status=400)
+            return _json_response({'error': 'Message cannot be empty'}, status=400)
 
         # Get Groq client
         try:
-            groq_client = get_groq_client()
+            groq_client = get_async_groq_client()
         except ValueError as e:
-            return JsonResponse({'error': str(e)}, status=500)
+            return _json_response({'error': str(e)}, status=500)
 
         # Get conversation history if available
         conversation_history = data.get('history', [])
@@ -149,11 +519,9 @@ def chat(request):  # pylint: disable=too-many-locals,too-many-branches,too-many
 
         # Check if there are active documents for this specific chat
         # (supports multiple documents)
-        chat_documents = request.session.get('chat_documents', {})
-        # Dict: {chat_id: [documents]}
-        active_documents = (
-            chat_documents.get(chat_id, []) if chat_id else []
-        )  # List of dicts: {id, filename, text}
+        active_documents = await sync_to_async(_get_active_documents)(
+            request, chat_id
+        )
 
         # Prepare messages for Groq API
         messages = []  # pylint: disable=redefined-outer-name
@@ -162,55 +530,13 @@ def chat(request):  # pylint: disable=too-many-locals,too-many-branches,too-many
         if active_documents:
             doc_count = len(active_documents)
             if doc_count == 1:
-                system_content = (
-                    "You are a helpful AI assistant with access to a "
-                    "document that the user has uploaded.\n"
-                    "You can see the full content of the document and "
-                    "should answer questions based on it.\n"
-                    "When the user asks to \"summarize\" or \"summarize "
-                    "the attached pdf\" or similar, automatically provide "
-                    "a summary of the document.\n"
-                    "Provide brief, concise answers that cover all "
-                    "important information comprehensively.\n"
-                    "Be succinct but ensure you include all key points.\n"
-                    "When answering, use information from the document "
-                    "when relevant.\n"
-                    "Never say you can't access attachments or ask the "
-                    "user to paste text - you already have the document "
-                    "content."
-                )
+                system_content = _SYSTEM_PROMPT_SINGLE_DOC
             else:
-                system_content = (
-                    f"You are a helpful AI assistant with access to "
-                    f"{doc_count} documents that the user has uploaded.\n"
-                    f"You can see the full content of all documents and "
-                    f"should answer questions based on them.\n"
-                    f"The documents are numbered: Document 1 (first "
-                    f"document), Document 2 (second document), etc.\n"
-                    f"When the user asks to \"summarize the first document\" "
-                    f"or \"summarize document 1\", summarize Document 1.\n"
-                    f"When the user asks to \"summarize the second document\" "
-                    f"or \"summarize document 2\", summarize Document 2.\n"
-                    f"When the user asks to \"summarize\" without "
-                    f"specifying, summarize all documents.\n"
-                    f"Provide brief, concise answers that cover all "
-                    f"important information comprehensively.\n"
-                    f"Be succinct but ensure you include all key points.\n"
-                    f"When answering, use information from the relevant "
-                    f"document(s) when relevant.\n"
-                    f"Never say you can't access attachments or ask the "
-                    f"user to paste text - you already have the document "
-                    f"content."
+                system_content = _SYSTEM_PROMPT_MULTI_DOC.format(
+                    doc_count=doc_count
                 )
         else:
-            system_content = (
-                "You are a helpful AI assistant. Provide brief, concise "
-                "answers that cover all important information "
-                "comprehensively. Be succinct but ensure you include all "
-                "key points. Keep responses focused and to the point while "
-                "maintaining completeness. Use clear, direct language and "
-                "avoid unnecessary elaboration."
-            )
+            system_content = _SYSTEM_PROMPT_NO_DOC
 
         messages.append({
             "role": "system",
@@ -219,24 +545,10 @@ def chat(request):  # pylint: disable=too-many-locals,too-many-branches,too-many
 
         # Add document context as hidden context if available
         if active_documents:
-            # Build context from all documents
-            doc_contexts = []
-            for idx, doc in enumerate(active_documents, 1):
-                doc_text = doc.get('text', '')
-                doc_filename = doc.get('filename', f'Document {idx}')
-                # Truncate each document if needed
-                # (max 15000 chars per document for context)
-                if len(doc_text) > 15000:
-                    doc_text = (
-                        doc_text[:15000] +
-                        "\n\n[Document content continues but was "
-                        "truncated...]"
-                    )
-                doc_contexts.append(
-                    f"Document {idx} ('{doc_filename}'):\n{doc_text}"
-                )
-
-            all_docs_text = "\n\n---\n\n".join(doc_contexts)
+            # Prebuilt at upload time; falls back to building on a miss
+            all_docs_text = await sync_to_async(_get_document_context)(
+                request, chat_id, active_documents
+            )
 
             # Inject document context before user message
             messages.append({
@@ -249,14 +561,16 @@ def chat(request):  # pylint: disable=too-many-locals,too-many-branches,too-many
                 )
             })
 
-        # Add conversation history
-        for msg in conversation_history:
-            # Skip system messages from history to avoid duplication
-            if msg.get('role') != 'system':
-                messages.append({
-                    "role": msg.get('role', 'user'),
-                    "content": msg.get('content', '')
-                })
+        # Add conversation history in one pass, skipping system messages
+        # to avoid duplication
+        messages.extend(
+            {
+                "role": msg.get('role', 'user'),
+                "content": msg.get('content', '')
+            }
+            for msg in conversation_history
+            if msg.get('role') != 'system'
+        )
 
         # Add current user message
         messages.append({
@@ -269,7 +583,19 @@ def chat(request):  # pylint: disable=too-many-locals,too-many-branches,too-many
         # Available models: llama-3.1-8b-instant, llama-3.1-70b-versatile, mixtral-8x7b-32768
         model = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
 
-        chat_completion = groq_client.chat.completions.create(
+        # Stream tokens to the browser as they arrive when the client
+        # opts in ({"stream": true}), so perceived latency is the time to
+        # first token instead of the full completion
+        if data.get('stream'):
+            return StreamingHttpResponse(
+                _chat_event_stream(
+                    request, groq_client, model, messages,
+                    chat_id, user_message
+                ),
+                content_type='text/event-stream'
+            )
+
+        chat_completion = await groq_client.chat.completions.create(
             model=model,
             messages=messages,
             temperature=0.7,
@@ -280,66 +606,21 @@ def chat(request):  # pylint: disable=too-many-locals,too-many-branches,too-many
         ai_response = chat_completion.choices[0].message.content
 
         # AUTOMATICALLY SAVE CONVERSATION TO DATABASE
-        # Get or create chat for this conversation
-        if not chat_id:
-            # Generate a chat_id if not provided
-            chat_id = str(uuid.uuid4())
-
-        try:
-            # pylint: disable=no-member,redefined-outer-name
-            chat = Chat.objects.get(chat_id=chat_id, user=request.user)
-        except Chat.DoesNotExist:  # pylint: disable=no-member
-            # Create new chat with title from first user message
-            title = user_message[:50] if len(user_message) > 50 else user_message
-            if not title:
-                title = 'New Chat'
-            # Get next global session_id
-            # (starting from 1, sequential across all users)
-            session_id = Chat.get_next_session_id()
-            # pylint: disable=no-member
-            chat = Chat.objects.create(
-                chat_id=chat_id,
-                session_id=session_id,
-                user=request.user,
-                title=title
-            )
-
-        # Save user message to database
-        # pylint: disable=no-member
-        ChatMessage.objects.create(
-            chat=chat,  # pylint: disable=redefined-outer-name
-            role='user',
-            content=user_message
-        )
-
-        # Save AI response to database
-        ChatMessage.objects.create(
-            chat=chat,  # pylint: disable=redefined-outer-name
-            role='assistant',
-            content=ai_response
+        chat_id = await sync_to_async(_persist_chat_turn)(
+            request, chat_id, user_message, ai_response
         )
 
-        # Update conversation history in Chat model
-        chat.add_to_history('user', user_message)
-        chat.add_to_history('assistant', ai_response)
-
-        # Update chat title if it's still "New Chat" and we have a better title
-        if chat.title == 'New Chat' and user_message:
-            title = user_message[:50] if len(user_message) > 50 else user_message
-            chat.title = title
-            chat.save()
-
-        return JsonResponse({
+        return _json_response({
             'response': ai_response,
             'status': 'success',
             'chat_id': chat_id  # Return chat_id so frontend can use it
         })
 
     except json.JSONDecodeError:
-        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        return _json_response({'error': 'Invalid JSON'}, status=400)
     except Exception as e:  # pylint: disable=broad-exception-caught
-        print(f"Error in chat: {traceback.format_exc()}")
-        return JsonResponse({'error': str(e)}, status=500)
+        logger.exception("Error in chat")
+        return _json_response({'error': str(e)}, status=500)
 
 @login_required
 @csrf_exempt
@@ -347,18 +628,24 @@ def chat(request):  # pylint: disable=too-many-locals,too-many-branches,too-many
 def get_chats(request):
     """Get all chats for the current user"""
     try:
+        # .values() fetches just the three displayed columns and skips
+        # model instantiation - in particular it leaves the (potentially
+        # large) conversation_history JSON on the server
         # pylint: disable=no-member
-        chats = Chat.objects.filter(user=request.user)
-        chats_data = []
-        for chat in chats:  # pylint: disable=redefined-outer-name
-            chats_data.append({
-                'id': chat.chat_id,
-                'title': chat.title,
-                'updatedAt': int(chat.updated_at.timestamp() * 1000)
-            })
-        return JsonResponse({'chats': chats_data, 'status': 'success'})
+        chats = Chat.objects.filter(user=request.user).values(
+            'chat_id', 'title', 'updated_at'
+        )
+        chats_data = [
+            {
+                'id': row['chat_id'],
+                'title': row['title'],
+                'updatedAt': int(row['updated_at'].timestamp() * 1000)
+            }
+            for row in chats
+        ]
+        return _json_response({'chats': chats_data, 'status': 'success'})
     except Exception as e:  # pylint: disable=broad-exception-caught
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @login_required
 @csrf_exempt
@@ -366,23 +653,23 @@ def get_chats(request):
 def get_chat(request, chat_id):
     """Get a specific chat with all messages"""
     try:
+        # Fetch only the columns the response uses; .values() on the
+        # messages skips model instantiation per row
         # pylint: disable=no-member,redefined-outer-name
-        chat = get_object_or_404(Chat, chat_id=chat_id, user=request.user)
-        messages = chat.messages.all()  # pylint: disable=no-member,redefined-outer-name
-        messages_data = []
-        history_data = []
-
-        for msg in messages:
-            messages_data.append({
-                'role': msg.role,
-                'content': msg.content
-            })
-            history_data.append({
-                'role': msg.role,
-                'content': msg.content
-            })
-
-        return JsonResponse({
+        chat = get_object_or_404(
+            Chat.objects.only('chat_id', 'title'),
+            chat_id=chat_id, user=request.user
+        )
+        messages = chat.messages.values('role', 'content')  # pylint: disable=no-member,redefined-outer-name
+        # The two response fields are identical, so build the list once
+        # and share it - the JSON encoder renders both keys the same way
+        messages_data = [
+            {'role': msg['role'], 'content': msg['content']}
+            for msg in messages
+        ]
+        history_data = messages_data
+
+        return _json_response({
             'chat': {
                 'id': chat.chat_id,
                 'title': chat.title,
@@ -392,10 +679,10 @@ def get_chat(request, chat_id):
             'status': 'success'
         })
     except Chat.DoesNotExist:  # pylint: disable=no-member
-        return JsonResponse({'error': 'Chat not found'}, status=404)
+        return _json_response({'error': 'Chat not found'}, status=404)
     except Exception as e:  # pylint: disable=broad-exception-caught
-        print(f"Error in get_chat: {traceback.format_exc()}")
-        return JsonResponse({'error': str(e)}, status=500)
+        logger.exception("Error in get_chat")
+        return _json_response({'error': str(e)}, status=500)
 
 @login_required
 @csrf_exempt
@@ -403,53 +690,65 @@ def get_chat(request, chat_id):
 def save_chat(request, chat_id):
     """Save or update a chat"""
     try:
-        data = json.loads(request.body)
+        data = _json_loads(request.body)
         title = data.get('title', 'New Chat')
         messages_data = data.get('messages', [])
         # history_data is kept for potential future use
         _ = data.get('history', [])  # pylint: disable=unused-variable
 
         if not chat_id:
-            return JsonResponse({'error': 'chat_id is required'}, status=400)
+            return _json_response({'error': 'chat_id is required'}, status=400)
 
-        # Get or create chat (user-specific)
-        try:
-            # pylint: disable=no-member,redefined-outer-name
-            chat = Chat.objects.get(chat_id=chat_id, user=request.user)
-            chat.title = title
-            chat.save()
-            # Delete existing messages
-            chat.messages.all().delete()  # pylint: disable=no-member
-        except Chat.DoesNotExist:  # pylint: disable=no-member
-            # Get next global session_id
-            # (starting from 1, sequential across all users)
-            session_id = Chat.get_next_session_id()
-            chat = Chat.objects.create(  # pylint: disable=redefined-outer-name
-                chat_id=chat_id,
-                session_id=session_id,
-                user=request.user,
-                title=title
-            )
+        # Get or create chat (user-specific). One transaction for the
+        # delete-and-rewrite so a failed save can't leave the chat with
+        # its messages deleted but not replaced, and so the whole update
+        # commits (and fsyncs) once
+        with transaction.atomic():
+            try:
+                # pylint: disable=no-member,redefined-outer-name
+                chat = Chat.objects.select_for_update().get(
+                    chat_id=chat_id, user=request.user
+                )
+                chat.title = title
+                chat.save(update_fields=['title', 'updated_at'])
+                # Delete existing messages
+                chat.messages.all().delete()  # pylint: disable=no-member
+            except Chat.DoesNotExist:  # pylint: disable=no-member
+                # Get next global session_id
+                # (starting from 1, sequential across all users)
+                session_id = Chat.get_next_session_id()
+                chat = Chat.objects.create(  # pylint: disable=redefined-outer-name
+                    chat_id=chat_id,
+                    session_id=session_id,
+                    user=request.user,
+                    title=title
+                )
 
-        # Create messages
-        for msg_data in messages_data:
+            # Create messages - one INSERT for the whole batch instead of
+            # a round-trip per message
             # pylint: disable=no-member
-            ChatMessage.objects.create(
-                chat=chat,  # pylint: disable=redefined-outer-name
-                role=msg_data.get('role', 'user'),
-                content=msg_data.get('content', '')
+            ChatMessage.objects.bulk_create(
+                [
+                    ChatMessage(
+                        chat=chat,
+                        role=msg_data.get('role', 'user'),
+                        content=msg_data.get('content', '')
+                    )
+                    for msg_data in messages_data
+                ],
+                batch_size=500
             )
 
-        return JsonResponse({
+        return _json_response({
             'chat_id': chat.chat_id,
             'status': 'success'
         })
     except json.JSONDecodeError:
-        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        return _json_response({'error': 'Invalid JSON'}, status=400)
     except Exception as e:  # pylint: disable=broad-exception-caught
         # Log the full traceback for debugging
-        print(f"Error in save_chat: {traceback.format_exc()}")
-        return JsonResponse({'error': str(e)}, status=500)
+        logger.exception("Error in save_chat")
+        return _json_response({'error': str(e)}, status=500)
 
 @login_required
 @csrf_exempt
@@ -457,22 +756,105 @@ def save_chat(request, chat_id):
 def delete_chat(request, chat_id):
     """Delete a chat"""
     try:
-        # pylint: disable=no-member,redefined-outer-name
-        chat = get_object_or_404(Chat, chat_id=chat_id, user=request.user)
-        chat.delete()
-        return JsonResponse({'status': 'success'})
+        # One DELETE (with cascade) instead of fetching the row first
+        # pylint: disable=no-member
+        deleted, _ = Chat.objects.filter(
+            chat_id=chat_id, user=request.user
+        ).delete()
+        if not deleted:
+            return _json_response({'error': 'Chat not found'}, status=404)
+        return _json_response({'status': 'success'})
     except Exception as e:  # pylint: disable=broad-exception-caught
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
+
+# Background extraction pool for uploads that opt in with async=1.
+# Two workers is enough: extraction is mostly C-level (PDF parsing) and
+# uploads are rare compared to chat turns
+_EXTRACT_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+
+def _activate_document(user_id, chat_id, document_id, filename,
+                       extracted_text):
+    """Make an extracted document active for a chat: truncate, store it
+    in the docstore and prebuild the prompt context. Returns the stored
+    text length (0 when there was no usable text)."""
+    if not extracted_text or not extracted_text.strip():
+        # Don't add to the store if no text extracted
+        return 0
+
+    # Truncate if too large
+    # (max 50000 chars per document to avoid token limits)
+    max_text_length = 50000
+    if len(extracted_text) > max_text_length:
+        extracted_text = (
+            extracted_text[:max_text_length] +
+            "\n\n[Document truncated for length...]"
+        )
+
+    # Get existing active documents for this chat (or empty list if new chat)
+    active_documents = docstore.get_documents(user_id, chat_id)
+
+    # Remove this document if it already exists (to avoid duplicates)
+    active_documents = [d for d in active_documents if d.get('id') != document_id]
+
+    # Add new document; the summary flows read the full text while chat
+    # context uses the pre-truncated copy
+    active_documents.append({
+        'id': document_id,
+        'filename': filename,
+        'text': extracted_text,
+        'context_text': _truncate_for_context(extracted_text)
+    })
+
+    # Keep only the 2 most recent documents (like ChatGPT)
+    if len(active_documents) > 2:
+        active_documents = active_documents[-2:]
+
+    docstore.set_documents(user_id, chat_id, active_documents)
+    # Prebuild the prompt-context block now so chat turns do a single
+    # cache GET instead of re-truncating and re-joining the document
+    # text on every request
+    docstore.set_context(
+        user_id, chat_id, _build_document_context(active_documents)
+    )
+    return len(extracted_text)
+
+def _extract_in_background(document_id, chat_id, user_id, content,
+                           filename, file_type):
+    """Run text extraction for an uploaded file off the request thread,
+    then store the result and activate the document for its chat.
+    Failures leave extracted_text empty ('' = done, no text) so the
+    status endpoint never reports 'processing' forever."""
+    # pylint: disable=no-member,broad-exception-caught
+    extracted_text = ''
+    try:
+        uploaded_file = SimpleUploadedFile(filename, content)
+        extracted_text = extract_text_from_file(uploaded_file, file_type)
+    except Exception:
+        logger.exception("Error extracting document %s", document_id)
+    try:
+        Document.objects.filter(id=document_id).update(
+            extracted_text=extracted_text or ''
+        )
+        _activate_document(
+            user_id, chat_id, document_id, filename, extracted_text
+        )
+    finally:
+        # This thread's DB connection isn't managed by the
+        # request/response cycle, so close it explicitly
+        connections.close_all()
 
 @login_required
 @csrf_exempt
 @require_http_methods(["POST"])
 def upload_document(request):
     """Handle document upload and automatic text extraction.
-    Stores extracted text in session per chat_id for automatic LLM context injection."""
+    Stores extracted text per chat_id for automatic LLM context
+    injection. With async=1 in the form data, extraction runs in a
+    background thread and the view returns immediately; the frontend can
+    poll the document status endpoint."""
     try:  # pylint: disable=too-many-locals
         if 'file' not in request.FILES:
-            return JsonResponse({'error': 'No file provided'}, status=400)
+            return _json_response({'error': 'No file provided'}, status=400)
 
         uploaded_file = request.FILES['file']
 
@@ -482,11 +864,40 @@ def upload_document(request):
         # Validate file size (max 10MB)
         max_size = 10 * 1024 * 1024  # 10MB
         if uploaded_file.size > max_size:
-            return JsonResponse({'error': 'File size exceeds 10MB limit'}, status=400)
+            return _json_response({'error': 'File size exceeds 10MB limit'}, status=400)
 
         # Process file in-memory (no file storage)
         file_type = get_file_type(uploaded_file.name)
 
+        # If no chat_id provided, use a default key (backward compatibility)
+        store_key = chat_id if chat_id else 'default'
+
+        if request.POST.get('async'):
+            # Defer extraction so a multi-second PDF parse doesn't hold
+            # the HTTP worker; extracted_text=None marks 'processing'
+            # for the status endpoint
+            # pylint: disable=no-member
+            document = Document.objects.create(
+                user=request.user,
+                filename=uploaded_file.name,
+                file_type=file_type,
+                file_size=uploaded_file.size,
+                extracted_text=None
+            )
+            _EXTRACT_EXECUTOR.submit(
+                _extract_in_background,
+                document.id, store_key, request.user.id,
+                uploaded_file.read(), uploaded_file.name, file_type
+            )
+            return _json_response({
+                'status': 'processing',
+                'document_id': document.id,
+                'filename': document.filename,
+                'file_type': document.file_type,
+                'file_size': document.file_size,
+                'message': 'Document uploaded; text extraction in progress'
+            }, status=202)
+
         # AUTOMATIC TEXT EXTRACTION - happens immediately on upload (in-memory)
         extracted_text = extract_text_from_file(uploaded_file, file_type)
 
@@ -500,55 +911,14 @@ def upload_document(request):
             extracted_text=extracted_text
         )
 
-        # Store extracted text in session memory per chat_id for automatic LLM injection
+        # Store extracted text per chat_id for automatic LLM injection
         # Support multiple documents (up to 2 like ChatGPT)
-        if extracted_text and extracted_text.strip():
-            # Truncate if too large
-            # (max 50000 chars per document to avoid token limits)
-            max_text_length = 50000
-            if len(extracted_text) > max_text_length:
-                extracted_text = (
-                    extracted_text[:max_text_length] +
-                    "\n\n[Document truncated for length...]"
-                )
-
-            # Get chat-specific documents dictionary
-            chat_documents = request.session.get('chat_documents', {})
-
-            # Get existing active documents for this chat (or empty list if new chat)
-            if chat_id:
-                active_documents = chat_documents.get(chat_id, [])
-            else:
-                active_documents = []
-
-            # Remove this document if it already exists (to avoid duplicates)
-            active_documents = [d for d in active_documents if d.get('id') != document.id]
-
-            # Add new document
-            active_documents.append({
-                'id': document.id,
-                'filename': document.filename,
-                'text': extracted_text
-            })
-
-            # Keep only the 2 most recent documents (like ChatGPT)
-            if len(active_documents) > 2:
-                active_documents = active_documents[-2:]
-
-            # Store documents per chat_id
-            if chat_id:
-                chat_documents[chat_id] = active_documents
-            else:
-                # If no chat_id provided, use a default key (backward compatibility)
-                chat_documents['default'] = active_documents
-
-            request.session['chat_documents'] = chat_documents
-            text_length = len(extracted_text)
-        else:
-            # Don't add to session if no text extracted
-            text_length = 0
+        text_length = _activate_document(
+            request.user.id, store_key, document.id, document.filename,
+            extracted_text
+        )
 
-        return JsonResponse({
+        return _json_response({
             'status': 'success',
             'document_id': document.id,
             'filename': document.filename,
@@ -559,25 +929,121 @@ def upload_document(request):
         })
 
     except Exception as e:  # pylint: disable=broad-exception-caught
-        print(f"Error in upload_document: {traceback.format_exc()}")
-        return JsonResponse({'error': str(e)}, status=500)
+        logger.exception("Error in upload_document")
+        return _json_response({'error': str(e)}, status=500)
+
+@login_required
+@csrf_exempt
+@require_http_methods(["GET"])
+def document_status(request, document_id):
+    """Report extraction status for a document uploaded with async=1.
+    extracted_text is None while the background extraction is running."""
+    try:
+        # pylint: disable=no-member
+        document = get_object_or_404(
+            Document.objects.only('filename', 'extracted_text'),
+            id=document_id, user=request.user
+        )
+        if document.extracted_text is None:
+            return _json_response({
+                'status': 'processing',
+                'document_id': document_id,
+                'filename': document.filename
+            })
+        return _json_response({
+            'status': 'ready',
+            'document_id': document_id,
+            'filename': document.filename,
+            'extracted_text_length': len(document.extracted_text)
+        })
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        return _json_response({'error': str(e)}, status=500)
+
+async def _summarize_one(groq_client, model, idx, doc_data):
+    """Summarize one active document with the async Groq client.
+    Returns the formatted summary block, or None for empty documents."""
+    doc_text = doc_data.get('text', '')
+    doc_filename = doc_data.get('filename', f'Document {idx}')
+
+    if not doc_text or not doc_text.strip():
+        return None
+
+    prompt = _SUMMARY_PROMPT_TMPL.format(
+        idx=idx, filename=doc_filename, length=len(doc_text), doc=doc_text
+    )
+
+    chat_completion = await groq_client.chat.completions.create(
+        model=model,
+        messages=[
+            {
+                "role": "system",
+                "content": (
+                    "You are a helpful assistant that provides clear, "
+                    "comprehensive summaries of documents."
+                )
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+        temperature=0.7,
+        max_tokens=1000
+    )
+
+    summary = chat_completion.choices[0].message.content
+    return f"**Document {idx}: {doc_filename}**\n\n{summary}"
+
+def _persist_summary(request, chat_id, doc_filename, summary):
+    """Save a summarize turn (request + summary) to the chat's history.
+    Runs in a worker thread when called from async views."""
+    # pylint: disable=no-member,redefined-outer-name
+    # One transaction (and one commit) for the whole summarize write
+    with transaction.atomic():
+        chat, _created = Chat.objects.select_for_update().get_or_create(
+            chat_id=chat_id,
+            user=request.user,
+            defaults={
+                'session_id': Chat.get_next_session_id,
+                'title': f'Summary: {doc_filename}',
+            }
+        )
+
+        # Save the request and the summary in one INSERT
+        user_msg = f"Summarize: {doc_filename}"
+        ChatMessage.objects.bulk_create([
+            ChatMessage(chat=chat, role='user', content=user_msg),
+            ChatMessage(chat=chat, role='assistant', content=summary),
+        ])
+
+        # Update conversation history in Chat model
+        chat.append_history_bulk([
+            ('user', user_msg),
+            ('assistant', summary),
+        ])
+        chat.save(update_fields=['conversation_history', 'updated_at'])
 
 @login_required
 @csrf_exempt
 @require_http_methods(["POST"])
-def summarize_document(request):  # pylint: disable=too-many-locals,too-many-return-statements,too-many-branches,too-many-statements
-    """Summarize a document using AI. Supports position-based requests (first, second, 1, 2)"""
+async def summarize_document(request, document_id=None):  # pylint: disable=too-many-locals,too-many-return-statements,too-many-branches,too-many-statements
+    """Summarize a document using AI. Supports position-based requests (first, second, 1, 2).
+    Multiple documents are summarized concurrently with asyncio.gather.
+    The document id arrives in the URL (api/documents/<id>/summarize/),
+    with the request body as fallback for callers that only send it
+    there."""
     try:
-        data = json.loads(request.body)
-        document_id = data.get('document_id')
+        data = _json_loads(request.body)
+        document_id = document_id or data.get('document_id')
         position = data.get('position', '').lower().strip()  # 'first', 'second', '1', '2', or None
 
         # Get chat_id to scope documents per chat
         chat_id = data.get('chat_id')
 
         # Get active documents for this specific chat from session
-        chat_documents = request.session.get('chat_documents', {})
-        active_documents = chat_documents.get(chat_id, []) if chat_id else []
+        active_documents = await sync_to_async(_get_active_documents)(
+            request, chat_id
+        )
 
         # Determine which document to summarize
         document_to_summarize = None
@@ -585,12 +1051,12 @@ def summarize_document(request):  # pylint: disable=too-many-locals,too-many-ret
 
         if position:
             # Position-based selection
-            if position in ['first', '1']:
+            if position in _FIRST_POSITIONS:
                 doc_index = 0
-            elif position in ['second', '2']:
+            elif position in _SECOND_POSITIONS:
                 doc_index = 1
             else:
-                return JsonResponse({
+                return _json_response({
                     'error': (
                         f'Invalid position: {position}. '
                         f'Use "first", "second", "1", or "2"'
@@ -602,7 +1068,7 @@ def summarize_document(request):  # pylint: disable=too-many-locals,too-many-ret
                 document_id = doc_data.get('id')
                 document_to_summarize = doc_data
             else:
-                return JsonResponse({
+                return _json_response({
                     'error': (
                         f'Document {position} not found. '
                         f'Only {len(active_documents)} document(s) available.'
@@ -619,9 +1085,11 @@ def summarize_document(request):  # pylint: disable=too-many-locals,too-many-ret
 
             # If not in active documents, get from database
             if not document_to_summarize:
-                document = get_object_or_404(Document, id=document_id, user=request.user)
+                document = await sync_to_async(get_object_or_404)(
+                    Document, id=document_id, user=request.user
+                )
                 if not document.extracted_text:
-                    return JsonResponse({'error': 'No text extracted from document'}, status=400)
+                    return _json_response({'error': 'No text extracted from document'}, status=400)
                 document_to_summarize = {
                     'id': document.id,
                     'filename': document.filename,
@@ -630,63 +1098,25 @@ def summarize_document(request):  # pylint: disable=too-many-locals,too-many-ret
         else:
             # No position or ID specified - summarize all documents
             if not active_documents:
-                return JsonResponse({'error': 'No documents available to summarize'}, status=400)
-
-            # Summarize all documents
-            summaries = []
-            for idx, doc_data in enumerate(active_documents, 1):
-                doc_text = doc_data.get('text', '')
-                doc_filename = doc_data.get('filename', f'Document {idx}')
-
-                if not doc_text or not doc_text.strip():
-                    continue
-
-                # Get Groq client
-                try:
-                    groq_client = get_groq_client()
-                except ValueError as e:
-                    return JsonResponse({'error': str(e)}, status=500)
-
-                full_text_length = len(doc_text)
-                prompt = (
-                    f"Please provide a comprehensive summary of "
-                    f"Document {idx} ('{doc_filename}').\n"
-                    f"The document is {full_text_length} characters long. "
-                    f"Here is the content:\n\n"
-                    f"{doc_text}\n\n"
-                    f"Please provide:\n"
-                    f"1. A brief overview (2-3 sentences)\n"
-                    f"2. Key points and main topics\n"
-                    f"3. Important details or findings\n"
-                    f"4. Any conclusions or recommendations if present\n\n"
-                    f"Format your response in a clear, structured manner."
-                )
-
-                model = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
-                chat_completion = groq_client.chat.completions.create(
-                    model=model,
-                    messages=[
-                        {
-                            "role": "system",
-                            "content": (
-                        "You are a helpful assistant that provides clear, "
-                        "comprehensive summaries of documents."
-                    )
-                        },
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    temperature=0.7,
-                    max_tokens=1000
-                )
+                return _json_response({'error': 'No documents available to summarize'}, status=400)
 
-                summary = chat_completion.choices[0].message.content
-                summaries.append(f"**Document {idx}: {doc_filename}**\n\n{summary}")
+            # Get Groq client
+            try:
+                groq_client = get_async_groq_client()
+            except ValueError as e:
+                return _json_response({'error': str(e)}, status=500)
+
+            # Summarize all documents concurrently - wall clock becomes
+            # the slowest single call instead of the sum of all calls
+            model = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
+            results = await asyncio.gather(*[
+                _summarize_one(groq_client, model, idx, doc_data)
+                for idx, doc_data in enumerate(active_documents, 1)
+            ])
+            summaries = [summary for summary in results if summary]
 
             combined_summary = "\n\n---\n\n".join(summaries)
-            return JsonResponse({
+            return _json_response({
                 'status': 'success',
                 'filename': f"{len(active_documents)} document(s)",
                 'summary': combined_summary
@@ -694,19 +1124,19 @@ def summarize_document(request):  # pylint: disable=too-many-locals,too-many-ret
 
         # Summarize single document
         if not document_to_summarize:
-            return JsonResponse({'error': 'Document not found'}, status=404)
+            return _json_response({'error': 'Document not found'}, status=404)
 
         doc_text = document_to_summarize.get('text', '')
         doc_filename = document_to_summarize.get('filename', 'Document')
 
         if not doc_text or not doc_text.strip():
-            return JsonResponse({'error': 'No text extracted from document'}, status=400)
+            return _json_response({'error': 'No text extracted from document'}, status=400)
 
         # Get Groq client
         try:
-            groq_client = get_groq_client()
+            groq_client = get_async_groq_client()
         except ValueError as e:
-            return JsonResponse({'error': str(e)}, status=500)
+            return _json_response({'error': str(e)}, status=500)
 
         # Prepare prompt for summarization
         full_text_length = len(doc_text)
@@ -730,7 +1160,7 @@ def summarize_document(request):  # pylint: disable=too-many-locals,too-many-ret
 
         model = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
 
-        chat_completion = groq_client.chat.completions.create(
+        chat_completion = await groq_client.chat.completions.create(
             model=model,
             messages=[
                 {
@@ -754,42 +1184,11 @@ def summarize_document(request):  # pylint: disable=too-many-locals,too-many-ret
         # AUTOMATICALLY SAVE CONVERSATION TO DATABASE
         chat_id = data.get('chat_id')
         if chat_id:
-            try:
-                # pylint: disable=no-member,redefined-outer-name
-                chat = Chat.objects.get(chat_id=chat_id, user=request.user)
-            except Chat.DoesNotExist:  # pylint: disable=no-member
-                # Create new chat with title from document filename
-                title = f'Summary: {doc_filename}'
-                # Get next session_id for this user (starting from 1)
-                session_id = Chat.get_next_session_id()
-                chat = Chat.objects.create(  # pylint: disable=redefined-outer-name
-                    chat_id=chat_id,
-                    session_id=session_id,
-                    user=request.user,
-                    title=title
-                )
-
-            # Save user message (document upload/summarize request)
-            user_msg = f"Summarize: {doc_filename}"
-            # pylint: disable=no-member
-            ChatMessage.objects.create(
-                chat=chat,  # pylint: disable=redefined-outer-name
-                role='user',
-                content=user_msg
-            )
-
-            # Save AI summary to database
-            ChatMessage.objects.create(
-                chat=chat,  # pylint: disable=redefined-outer-name
-                role='assistant',
-                content=summary
+            await sync_to_async(_persist_summary)(
+                request, chat_id, doc_filename, summary
             )
 
-            # Update conversation history in Chat model
-            chat.add_to_history('user', user_msg)
-            chat.add_to_history('assistant', summary)
-
-        return JsonResponse({
+        return _json_response({
             'status': 'success',
             'filename': doc_filename,
             'summary': summary,
@@ -797,133 +1196,257 @@ def summarize_document(request):  # pylint: disable=too-many-locals,too-many-ret
         })
 
     except json.JSONDecodeError:
-        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        return _json_response({'error': 'Invalid JSON'}, status=400)
     except Exception as e:  # pylint: disable=broad-exception-caught
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
+
+def _persist_document_qa(request, chat_id, filename, question, answer):
+    """Save a document Q&A turn, creating the chat when needed (one
+    transaction, one commit). Messages are only written for a newly
+    created chat, matching the endpoint's long-standing behavior.
+    Returns the chat_id used (generated when the caller had none)."""
+    # uuid4 reads urandom, so only pay for it when the caller didn't
+    # supply a chat_id; .hex skips hyphen formatting and stores/indexes
+    # 32 chars instead of 36
+    chat_id = chat_id or uuid.uuid4().hex
+
+    with transaction.atomic():
+        # Title for a chat created by this question; the callable
+        # session_id default only runs when a row is actually created
+        title = question[:50] if len(question) > 50 else question
+        if not title:
+            title = f"Document Q&A: {filename}"
+        # pylint: disable=no-member,redefined-outer-name
+        chat, created = Chat.objects.select_for_update().get_or_create(
+            chat_id=chat_id,
+            user=request.user,
+            defaults={
+                'session_id': Chat.get_next_session_id,
+                'title': title,
+            }
+        )
+        if created:
+            # Save the question/answer pair in one INSERT
+            ChatMessage.objects.bulk_create([
+                ChatMessage(chat=chat, role='user', content=question),
+                ChatMessage(chat=chat, role='assistant', content=answer),
+            ])
+
+            # Update conversation history in Chat model
+            chat.append_history_bulk([
+                ('user', question),
+                ('assistant', answer),
+            ])
+            chat.save(
+                update_fields=['conversation_history', 'updated_at']
+            )
+
+    return chat_id
+
+def _fetch_document_row(user, document_id):
+    """Light ownership check - id and filename only. The 8000 chars of
+    document text are pulled (and rendered into the prompt prefix) at
+    most once per document by _get_ask_prompt_prefix. Runs in a worker
+    thread when called from the async view."""
+    # pylint: disable=no-member
+    return (
+        Document.objects.filter(id=document_id, user=user)
+        .values('id', 'filename')
+        .first()
+    )
+
+def _get_ask_prompt_prefix(document_id):
+    """Return the rendered document portion of the Q&A prompt, or None
+    when the document has no extracted text.
+
+    The prefix is identical on every turn, so it's rendered once and
+    cached; later questions about the same document only append their
+    question text instead of re-fetching 8 KB from the database.
+    Keeping the document text as a byte-stable prefix (question last)
+    also lets provider-side prompt caching reuse the prefill across
+    turns."""
+    prefix = cache.get(_prefix_cache_key(document_id))
+    if prefix is not None:
+        return prefix
+    # Only the prompt head ever reaches Groq, so slice in the database
+    # (Substr) instead of materializing a potentially multi-MB
+    # extracted_text into Python; one extra char tells us whether
+    # truncation happened. With a tokenizer available the head is
+    # over-fetched (6 chars/token is a safe upper bound) so the token
+    # budget, not the char slice, is what binds - token-dense text no
+    # longer loses tail content to a premature character cut.
+    encoder = _get_token_encoder()
+    head_chars = 8000 if encoder is None else ASK_DOC_TOKEN_BUDGET * 6
+    # pylint: disable=no-member
+    doc_text = (
+        Document.objects.filter(id=document_id)
+        .annotate(head=Substr('extracted_text', 1, head_chars + 1))
+        .values_list('head', flat=True)
+        .first()
+    )
+    if not doc_text:
+        return None
+    if encoder is not None:
+        # Tokenization runs once per document; the rendered prefix is
+        # cached below, so later turns never re-encode
+        tokens = encoder.encode(doc_text)
+        if len(tokens) > ASK_DOC_TOKEN_BUDGET:
+            doc_text = (
+                encoder.decode(tokens[:ASK_DOC_TOKEN_BUDGET])
+                + DOC_TRUNCATION_SUFFIX
+            )
+    elif len(doc_text) > 8000:
+        doc_text = doc_text[:8000] + DOC_TRUNCATION_SUFFIX
+    prefix = _ASK_PROMPT_PREFIX_TMPL.format(doc=doc_text)
+    cache.set(_prefix_cache_key(document_id), prefix, PREFIX_CACHE_TTL)
+    return prefix
+
+async def _ask_event_stream(request, groq_client, model, messages, chat_id,
+                            document, question, answer_key):
+    """Yield a document answer as server-sent events, then cache it and
+    persist the turn once the stream closes (same semantics as the
+    non-streaming path). The final event carries the chat_id."""
+    # pylint: disable=broad-exception-caught
+    try:
+        stream = await groq_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=0.7,
+            max_tokens=1000,
+            stream=True,
+        )
+        parts = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content or ''
+            if delta:
+                parts.append(delta)
+                yield f"data: {_json_dumps({'delta': delta})}\n\n"
+        answer = ''.join(parts)
+        await sync_to_async(cache.set)(answer_key, answer, ANSWER_CACHE_TTL)
+
+        chat_id = await sync_to_async(_persist_document_qa)(
+            request, chat_id, document['filename'], question, answer
+        )
+        yield f"data: {_json_dumps({'done': True, 'chat_id': chat_id})}\n\n"
+    except Exception as e:
+        # Headers are already sent; the error has to travel in-band
+        yield f"data: {_json_dumps({'error': str(e)})}\n\n"
 
 @login_required
 @csrf_exempt
 @require_http_methods(["POST"])
-def ask_document(request):  # pylint: disable=too-many-locals
-    """Answer questions about a document using AI"""
+async def ask_document(request, document_id=None):  # pylint: disable=too-many-locals
+    """Answer questions about a document using AI.
+    Async so the worker serves other requests during the Groq round-trip.
+    The document id arrives in the URL (api/documents/<id>/ask/), with
+    the request body as fallback for callers that only send it there."""
     try:
-        data = json.loads(request.body)
-        document_id = data.get('document_id')
+        data = _json_loads(request.body)
+        document_id = document_id or data.get('document_id')
         question = data.get('question', '').strip()
 
         if not document_id:
-            return JsonResponse({'error': 'document_id is required'}, status=400)
+            return _json_response({'error': 'document_id is required'}, status=400)
 
         if not question:
-            return JsonResponse({'error': 'question is required'}, status=400)
-
-        document = get_object_or_404(Document, id=document_id, user=request.user)
-
-        if not document.extracted_text:
-            return JsonResponse({'error': 'No text extracted from document'}, status=400)
+            return _json_response({'error': 'question is required'}, status=400)
 
-        # Get Groq client
-        try:
-            groq_client = get_groq_client()
-        except ValueError as e:
-            return JsonResponse({'error': str(e)}, status=500)
+        document = await sync_to_async(_fetch_document_row)(
+            request.user, document_id
+        )
+        if document is None:
+            return _json_response({'error': 'Document not found'}, status=404)
+
+        # Repeat questions against the same (immutable once extracted)
+        # document skip the LLM call entirely. The lookup runs after the
+        # ownership filter above, and document ids are unique across
+        # users, so a cached answer is only ever served to the document's
+        # owner. The conversation is still persisted below either way.
+        answer_key = _answer_cache_key(document['id'], question)
+        answer = await sync_to_async(cache.get)(answer_key)
+        if answer is None:
+            # Get Groq client
+            try:
+                groq_client = get_async_groq_client()
+            except ValueError as e:
+                return _json_response({'error': str(e)}, status=500)
 
-        # Prepare prompt for Q&A
-        # Limit document text to avoid token limits (keep it reasonable)
-        doc_text = document.extracted_text
-        if len(doc_text) > 8000:
-            doc_text = doc_text[:8000] + "\n\n[Document truncated for length...]"
+            prefix = await sync_to_async(_get_ask_prompt_prefix)(
+                document['id']
+            )
+            if prefix is None:
+                return _json_response(
+                    {'error': 'No text extracted from document'}, status=400
+                )
 
-        prompt = (
-            f"Based on the following document, please answer the user's "
-            f"question.\n"
-            f"If the answer is not in the document, please say so clearly.\n\n"
-            f"Document content:\n{doc_text}\n\n"
-            f"User's question: {question}\n\n"
-            f"Please provide a clear, accurate answer based on the document "
-            f"content."
-        )
+            prompt = prefix + _ASK_PROMPT_QUESTION_TMPL.format(
+                question=question
+            )
 
-        model = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
+            model = os.getenv('GROQ_MODEL', 'llama-3.1-8b-instant')
 
-        chat_completion = groq_client.chat.completions.create(
-            model=model,
-            messages=[
+            messages = [  # pylint: disable=redefined-outer-name
                 {
                     "role": "system",
                     "content": (
-                        "You are a helpful assistant that answers questions "
-                        "based on provided documents. Be accurate and cite "
-                        "specific information from the document when possible."
+                        "You are a helpful assistant that answers "
+                        "questions based on provided documents. Be "
+                        "accurate and cite specific information from "
+                        "the document when possible."
                     )
                 },
                 {
                     "role": "user",
                     "content": prompt
                 }
-            ],
-            temperature=0.7,
-            max_tokens=1000,
-        )
-
-        answer = chat_completion.choices[0].message.content
-
-        # AUTOMATICALLY SAVE CONVERSATION TO DATABASE
-        chat_id = data.get('chat_id')
-        if not chat_id:
-            # Generate a chat_id if not provided
-            chat_id = str(uuid.uuid4())
-
-        try:
-            # pylint: disable=no-member,redefined-outer-name
-            chat = Chat.objects.get(chat_id=chat_id, user=request.user)
-        except Chat.DoesNotExist:  # pylint: disable=no-member
-            # Create new chat with title from question
-            title = question[:50] if len(question) > 50 else question
-            if not title:
-                title = f'Document Q&A: {document.filename}'
-            # Get next global session_id
-            # (starting from 1, sequential across all users)
-            session_id = Chat.get_next_session_id()
-            chat = Chat.objects.create(  # pylint: disable=redefined-outer-name
-                chat_id=chat_id,
-                session_id=session_id,
-                user=request.user,
-                title=title
-            )
+            ]
+
+            # Streaming path: first tokens reach the client as soon as
+            # Groq produces them instead of after the full completion.
+            # Only when the frontend opts in ({"stream": true}); caching
+            # and persistence happen when the stream closes.
+            if data.get('stream'):
+                return StreamingHttpResponse(
+                    _ask_event_stream(
+                        request, groq_client, model, messages,
+                        data.get('chat_id'), document, question, answer_key
+                    ),
+                    content_type='text/event-stream'
+                )
 
-            # Save user question to database
-            # pylint: disable=no-member
-            ChatMessage.objects.create(
-                chat=chat,  # pylint: disable=redefined-outer-name
-                role='user',
-                content=question
+            chat_completion = await groq_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=0.7,
+                max_tokens=1000,
             )
 
-            # Save AI answer to database
-            ChatMessage.objects.create(
-                chat=chat,  # pylint: disable=redefined-outer-name
-                role='assistant',
-                content=answer
+            answer = chat_completion.choices[0].message.content
+            await sync_to_async(cache.set)(
+                answer_key, answer, ANSWER_CACHE_TTL
             )
 
-            # Update conversation history in Chat model
-            chat.add_to_history('user', question)
-            chat.add_to_history('assistant', answer)
+        # AUTOMATICALLY SAVE CONVERSATION TO DATABASE (a cache hit with
+        # stream requested also lands here - the answer is already
+        # complete, so plain JSON costs nothing extra)
+        chat_id = await sync_to_async(_persist_document_qa)(
+            request, data.get('chat_id'), document['filename'],
+            question, answer
+        )
 
-        return JsonResponse({
+        return _json_response({
             'status': 'success',
             'answer': answer,
-            'document_id': document.id,
-            'filename': document.filename,
+            'document_id': document['id'],
+            'filename': document['filename'],
             'question': question,
             'chat_id': chat_id  # Return chat_id so frontend can use it
         })
 
     except json.JSONDecodeError:
-        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        return _json_response({'error': 'Invalid JSON'}, status=400)
     except Exception as e:  # pylint: disable=broad-exception-caught
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @login_required
 @csrf_exempt
@@ -931,21 +1454,34 @@ def ask_document(request):  # pylint: disable=too-many-locals
 def get_documents(request):
     """Get all documents for the current user"""
     try:
+        # .values() returns plain dicts and, crucially, leaves
+        # extracted_text out of the SELECT - the listing only needs to
+        # know whether text exists, which the has_text annotation
+        # computes in the database. (Timestamps still convert to epoch
+        # millis in Python; SQLite has no epoch extract.)
         # pylint: disable=no-member
-        documents = Document.objects.filter(user=request.user)
-        documents_data = []
-        for doc in documents:
-            documents_data.append({
-                'id': doc.id,
-                'filename': doc.filename,
-                'file_type': doc.file_type,
-                'file_size': doc.file_size,
-                'uploaded_at': int(doc.uploaded_at.timestamp() * 1000),
-                'has_text': bool(doc.extracted_text)
-            })
-        return JsonResponse({'documents': documents_data, 'status': 'success'})
+        # The isnull check keeps SQL's NULL > '' from yielding NULL
+        # instead of false for rows whose extraction hasn't finished
+        rows = Document.objects.filter(user=request.user).annotate(
+            has_text=Q(extracted_text__isnull=False) & Q(extracted_text__gt='')
+        ).values(
+            'id', 'filename', 'file_type', 'file_size',
+            'uploaded_at', 'has_text'
+        )
+        documents_data = [
+            {
+                'id': row['id'],
+                'filename': row['filename'],
+                'file_type': row['file_type'],
+                'file_size': row['file_size'],
+                'uploaded_at': int(row['uploaded_at'].timestamp() * 1000),
+                'has_text': row['has_text'],
+            }
+            for row in rows
+        ]
+        return _json_response({'documents': documents_data, 'status': 'success'})
     except Exception as e:  # pylint: disable=broad-exception-caught
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @login_required
 @csrf_exempt
@@ -953,23 +1489,20 @@ def get_documents(request):
 def clear_chat_documents(request):
     """Clear documents for a specific chat"""
     try:
-        data = json.loads(request.body)
+        data = _json_loads(request.body)
         chat_id = data.get('chat_id')
 
         if not chat_id:
-            return JsonResponse({'error': 'chat_id is required'}, status=400)
+            return _json_response({'error': 'chat_id is required'}, status=400)
 
         # Remove documents for this specific chat
-        chat_documents = request.session.get('chat_documents', {})
-        if chat_id in chat_documents:
-            del chat_documents[chat_id]
-            request.session['chat_documents'] = chat_documents
+        docstore.clear_chat(request.user.id, chat_id)
 
-        return JsonResponse({'status': 'success'})
+        return _json_response({'status': 'success'})
     except json.JSONDecodeError:
-        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        return _json_response({'error': 'Invalid JSON'}, status=400)
     except Exception as e:  # pylint: disable=broad-exception-caught
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
 
 @login_required
 @csrf_exempt
@@ -980,16 +1513,7 @@ def delete_document(request, document_id):
         document = get_object_or_404(Document, id=document_id, user=request.user)
 
         # Remove from active documents list for all chats if present
-        chat_documents = request.session.get('chat_documents', {})
-        for chat_id_key in list(chat_documents.keys()):
-            active_documents = chat_documents[chat_id_key]
-            active_documents = [d for d in active_documents if d.get('id') != document.id]
-            if active_documents:
-                chat_documents[chat_id_key] = active_documents
-            else:
-                # Remove chat entry if no documents left
-                del chat_documents[chat_id_key]
-        request.session['chat_documents'] = chat_documents
+        docstore.remove_document(request.user.id, document.id)
 
         # Also clear old session variables for backward compatibility
         if request.session.get('active_document_id') == document.id:
@@ -1001,6 +1525,6 @@ def delete_document(request, document_id):
                 request.session.pop('active_documents', None)
 
         document.delete()
-        return JsonResponse({'status': 'success'})
+        return _json_response({'status': 'success'})
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return _json_response({'error': str(e)}, status=500)
@@ -86,6 +86,30 @@ DATABASES = {
 }
 
 
+# Cache / sessions
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+#
+# When REDIS_URL is set (e.g. redis://127.0.0.1:6379/1 or
+# unix:///var/run/redis/redis.sock?db=1), the cache moves to Redis and
+# sessions are stored there instead of the django_session table. That
+# removes the SELECT+UPDATE on django_session that every authenticated
+# request otherwise pays - which adds up once chat_documents grows to
+# tens of KB per session. Without REDIS_URL the defaults (local-memory
+# cache, DB sessions) stay in place so development needs no Redis.
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+    SESSION_CACHE_ALIAS = 'default'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -117,6 +141,35 @@ USE_I18N = True
 USE_TZ = True
 
 
+# Logging
+# https://docs.djangoproject.com/en/6.0/topics/logging/
+# View errors go through logging (logger.exception) instead of print so
+# they carry level/timestamp and can be rerouted without code changes
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'simple': {
+            'format': '{levelname} {asctime} {name} {message}',
+            'style': '{',
+        },
+    },
+    'handlers': {
+        'console': {
+            'class': 'logging.StreamHandler',
+            'formatter': 'simple',
+        },
+    },
+    'loggers': {
+        'chat': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/6.0/howto/static-files/
 
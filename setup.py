@@ -0,0 +1,23 @@
+"""Optional build script for the Cython-accelerated admin parser.
+
+Run ``python setup.py build_ext --inplace`` to compile
+chat/_readable_parser.pyx. The project works without it - the admin
+falls back to the pure-Python parser when the extension is missing.
+"""
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        [Extension('chat._readable_parser', ['chat/_readable_parser.pyx'])],
+        language_level=3,
+    )
+
+setup(
+    name='clone-bot-ext',
+    version='0.1',
+    ext_modules=ext_modules,
+)